@@ -0,0 +1,210 @@
+"""
+Async Email Notification System for Birthday Party RSVPs
+aiosmtplib-backed variant of EmailNotifier for asyncio web servers
+(FastAPI, aiohttp) so sending never blocks the event loop
+"""
+
+import asyncio
+import logging
+import ssl
+import time
+from email.message import EmailMessage
+
+import aiosmtplib
+
+from email_notifier import (_GUEST_TPL, _RSVP_DEFAULTS, _RSVP_TPL,
+                            _SEND_TIMEOUT, _STATUS_BADGE, _now_footer,
+                            _party_key, _render_party_block)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncEmailNotifier:
+    def __init__(self, smtp_server, smtp_port, email, password, rate_window=60):
+        """
+        Initialize async email notifier
+
+        Args:
+            smtp_server: SMTP server address (e.g., 'smtp.gmail.com')
+            smtp_port: SMTP port (e.g., 587 for TLS)
+            email: Your email address
+            password: Your email password or app-specific password
+            rate_window: Seconds during which an identical email to the
+                same recipient is treated as a duplicate and dropped
+        """
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.email = email
+        self.password = password
+        self.rate_window = rate_window
+        self._last_sent = {}  # (recipient, body hash) -> monotonic ts
+        self._client = None
+        # One SSL context for all connections; building one reloads the
+        # CA store from disk, so don't pay that per handshake
+        self._ssl_ctx = ssl.create_default_context()
+        # SMTP is a stateful dialogue, so sends on the shared client are
+        # serialized; the event loop stays free during the socket waits
+        self._lock = asyncio.Lock()
+
+    async def _get_client(self):
+        """
+        Return a connected, logged-in aiosmtplib client, reusing the
+        previous one when it is still connected
+        """
+        if self._client is None or not self._client.is_connected:
+            self._client = aiosmtplib.SMTP(
+                hostname=self.smtp_server,
+                port=self.smtp_port,
+                start_tls=True,
+                tls_context=self._ssl_ctx,
+                timeout=_SEND_TIMEOUT
+            )
+            await self._client.connect()
+            await self._client.login(self.email, self.password)
+        return self._client
+
+    async def close(self):
+        """
+        Close the pooled SMTP client
+        """
+        if self._client is not None:
+            try:
+                await self._client.quit()
+            except Exception:
+                pass
+            self._client = None
+
+    async def send_rsvp_notification(self, rsvp_data, party_data):
+        """
+        Send email notification when someone RSVPs
+
+        Args:
+            rsvp_data: Dictionary containing RSVP information
+            party_data: Dictionary containing party information
+        """
+        subject = f"🎉 New RSVP for {party_data['child_name']}'s Birthday Party!"
+
+        # Fill in the optional fields once instead of .get() per field
+        rsvp = {**_RSVP_DEFAULTS, **rsvp_data}
+
+        html_body = _RSVP_TPL.render(rsvp=rsvp, party=party_data, received_at=_now_footer(),
+                                     badge=_STATUS_BADGE.get(rsvp['attendance_status'], _STATUS_BADGE['maybe']))
+
+        await self._send_email(self.email, subject, html_body)
+
+    async def send_confirmation_to_guest(self, rsvp_data, party_data):
+        """
+        Send confirmation email to the guest who submitted RSVP
+
+        Args:
+            rsvp_data: Dictionary containing RSVP information
+            party_data: Dictionary containing party information
+        """
+        subject = f"🎉 RSVP Confirmation - {party_data['child_name']}'s Birthday Party"
+
+        html_body = _GUEST_TPL.render(rsvp=rsvp_data, party=party_data,
+                                      party_block=_render_party_block(_party_key(party_data)))
+
+        await self._send_email(rsvp_data['email'], subject, html_body)
+
+    def _should_suppress(self, to_email, html_body):
+        """
+        True when an identical body already went to the same recipient
+        within the rate window — a double-submitted RSVP form, not a new
+        RSVP — so repeat submits don't burn SMTP dialogues or trip
+        provider throttling
+        """
+        key = (to_email, hash(html_body))
+        t = time.monotonic()
+        if t - self._last_sent.get(key, -self.rate_window) < self.rate_window:
+            logger.info("Suppressing duplicate send to %s", to_email)
+            return True
+        if len(self._last_sent) > 1024:
+            self._last_sent = {k: ts for k, ts in self._last_sent.items()
+                               if t - ts < self.rate_window}
+        self._last_sent[key] = t
+        return False
+
+    def _build_message(self, to_email, subject, html_body):
+        """
+        Build the MIME message for one email
+        """
+        message = EmailMessage()
+        message['From'] = self.email
+        message['To'] = to_email
+        message['Subject'] = subject
+
+        # Plain-text fallback plus the HTML alternative
+        message.set_content('See HTML version.')
+        message.add_alternative(html_body, subtype='html')
+        return message
+
+    async def _send_email(self, to_email, subject, html_body):
+        """
+        Internal method to send email
+        """
+        if self._should_suppress(to_email, html_body):
+            return True
+        try:
+            message = self._build_message(to_email, subject, html_body)
+
+            async with self._lock:
+                try:
+                    client = await self._get_client()
+                    await client.send_message(message)
+                except (aiosmtplib.SMTPServerDisconnected, ConnectionResetError, OSError):
+                    self._client = None
+                    client = await self._get_client()
+                    await client.send_message(message)
+
+            logger.info("Email sent to %s", to_email)
+            return True
+
+        except (aiosmtplib.SMTPException, OSError):
+            logger.exception("Error sending email to %s", to_email)
+            return False
+
+
+# Example usage
+if __name__ == '__main__':
+    async def main():
+        # Initialize email notifier (REPLACE WITH YOUR CREDENTIALS)
+        notifier = AsyncEmailNotifier(
+            smtp_server='smtp.gmail.com',
+            smtp_port=587,
+            email='your_email@gmail.com',  # Replace with your email
+            password='your_app_password'    # Replace with your app password
+        )
+
+        # Example party data
+        party_data = {
+            'child_name': 'Emma',
+            'age': 7,
+            'party_date': 'December 25, 2026',
+            'party_time_start': '3:00 PM',
+            'party_time_end': '6:00 PM',
+            'venue_name': 'Happy Kids Party Place',
+            'venue_address': '123 Rainbow Street, Funtown, State 12345'
+        }
+
+        # Example RSVP data
+        rsvp_data = {
+            'child_name': 'Sarah',
+            'parent_name': 'Jennifer Smith',
+            'email': 'jennifer@email.com',
+            'phone': '(555) 123-4567',
+            'attendance_status': 'yes',
+            'number_of_kids': 1,
+            'number_of_adults': 2,
+            'food_allergies': 'None',
+            'birthday_message': 'Happy Birthday Emma! Can\'t wait to celebrate with you!'
+        }
+
+        # Send notifications (both sends share the pooled client)
+        await asyncio.gather(
+            notifier.send_rsvp_notification(rsvp_data, party_data),
+            notifier.send_confirmation_to_guest(rsvp_data, party_data)
+        )
+        await notifier.close()
+
+    asyncio.run(main())
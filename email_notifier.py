@@ -3,301 +3,723 @@ Email Notification System for Birthday Party RSVPs
 Sends email notifications when someone fills up the RSVP form
 """
 
+import atexit
+import concurrent.futures
+import functools
+import logging
+import queue
+import re
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
+import socket
+import ssl
+import threading
+import time
+from email.message import EmailMessage
 import os
 from datetime import datetime
 
+import jinja2
+
+logger = logging.getLogger(__name__)
+
+
+def _minify_css(source):
+    """
+    Collapse whitespace in a CSS block, run once at import
+    """
+    source = re.sub(r'\s+', ' ', source)
+    return re.sub(r'\s*([{}:;,])\s*', r'\1', source).strip()
+
+
+def _minify_html(source):
+    """
+    Collapse inter-tag and run-on whitespace in a template source, run
+    once at import — before compilation, so the compiled template emits
+    minified output with no per-send cost (the SMTP DATA phase is
+    sequential, so fewer bytes is less latency)
+    """
+    source = re.sub(r'\s+', ' ', source)
+    return re.sub(r'>\s+<', '><', source).strip()
+
+
+# Static CSS for the two email bodies, kept out of the templates so the
+# scaffolding lives in one obvious place
+_RSVP_CSS = """
+            body {
+                font-family: 'Arial', sans-serif;
+                background-color: #f8f9fa;
+                padding: 20px;
+            }
+            .container {
+                max-width: 600px;
+                margin: 0 auto;
+                background: white;
+                border-radius: 15px;
+                padding: 30px;
+                box-shadow: 0 5px 20px rgba(0,0,0,0.1);
+            }
+            .header {
+                text-align: center;
+                margin-bottom: 30px;
+            }
+            .header h1 {
+                color: #FF6B9D;
+                font-size: 28px;
+                margin-bottom: 10px;
+            }
+            .info-box {
+                background: #FFE5F0;
+                padding: 20px;
+                border-radius: 10px;
+                margin-bottom: 20px;
+            }
+            .info-row {
+                margin-bottom: 10px;
+            }
+            .label {
+                font-weight: bold;
+                color: #666;
+            }
+            .value {
+                color: #333;
+            }
+            .status {
+                display: inline-block;
+                padding: 8px 15px;
+                border-radius: 20px;
+                color: white;
+                font-weight: bold;
+            }
+            .status-yes {
+                background: linear-gradient(135deg, #6BCB77, #4D96FF);
+            }
+            .status-no {
+                background: linear-gradient(135deg, #FF6B9D, #FF8FAB);
+            }
+            .message-box {
+                background: #E5F3FF;
+                padding: 15px;
+                border-radius: 10px;
+                margin-top: 20px;
+                font-style: italic;
+            }
+            .footer {
+                text-align: center;
+                margin-top: 30px;
+                color: #999;
+                font-size: 12px;
+            }
+"""
+
+_GUEST_CSS = """
+            body {
+                font-family: 'Arial', sans-serif;
+                background-color: #f8f9fa;
+                padding: 20px;
+            }
+            .container {
+                max-width: 600px;
+                margin: 0 auto;
+                background: white;
+                border-radius: 15px;
+                padding: 30px;
+                box-shadow: 0 5px 20px rgba(0,0,0,0.1);
+            }
+            .header {
+                text-align: center;
+                margin-bottom: 30px;
+            }
+            .header h1 {
+                color: #FF6B9D;
+                font-size: 28px;
+            }
+            .party-details {
+                background: linear-gradient(135deg, #FFE5F0, #E5F3FF);
+                padding: 25px;
+                border-radius: 10px;
+                margin-bottom: 20px;
+            }
+            .detail-row {
+                margin-bottom: 12px;
+                font-size: 16px;
+            }
+            .emoji {
+                margin-right: 8px;
+            }
+            .footer {
+                text-align: center;
+                margin-top: 30px;
+                padding-top: 20px;
+                border-top: 2px solid #FFE5F0;
+                color: #666;
+            }
+"""
+
+_RSVP_CSS = _minify_css(_RSVP_CSS)
+_GUEST_CSS = _minify_css(_GUEST_CSS)
+
+# Probe a pooled connection with NOOP before reuse once it has been idle
+# this many seconds
+_IDLE_PROBE_AFTER = 60
+
+# Fail fast when the SMTP host is unreachable instead of hanging on the
+# OS default connect timeout (75s on Linux); the established dialogue
+# gets a longer timeout
+_CONNECT_TIMEOUT = 5
+_SEND_TIMEOUT = 10
+
+# Optional RSVP fields, merged under the submitted data once per send so
+# the template reads every field directly instead of repeating
+# .get(..., default) lookups
+_RSVP_DEFAULTS = {
+    'number_of_kids': 1,
+    'number_of_adults': 1,
+    'food_allergies': '',
+    'birthday_message': '',
+}
+
+# Status badge text, looked up once per send instead of a nested ternary
+# inside the template
+_STATUS_BADGE = {
+    'yes': '✅ Coming!',
+    'no': '❌ Cannot Attend',
+    'maybe': '❓ Maybe',
+}
+
+# HTML body for the notification sent to the party host
+RSVP_HTML = _minify_html("""
+<html>
+    <head>
+        <style>""" + _RSVP_CSS + """</style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>🎉 New RSVP Received!</h1>
+                <p>Someone just responded to {{ party.child_name }}'s party invitation</p>
+            </div>
+
+            <div class="info-box">
+                <div class="info-row">
+                    <span class="label">👶 Child's Name:</span>
+                    <span class="value">{{ rsvp.child_name }}</span>
+                </div>
+                <div class="info-row">
+                    <span class="label">👨‍👩‍👧 Parent's Name:</span>
+                    <span class="value">{{ rsvp.parent_name }}</span>
+                </div>
+                <div class="info-row">
+                    <span class="label">📧 Email:</span>
+                    <span class="value">{{ rsvp.email }}</span>
+                </div>
+                <div class="info-row">
+                    <span class="label">📱 Phone:</span>
+                    <span class="value">{{ rsvp.phone }}</span>
+                </div>
+                <div class="info-row">
+                    <span class="label">Status:</span>
+                    <span class="status status-{{ rsvp.attendance_status }}">
+                        {{ badge }}
+                    </span>
+                </div>
+                <div class="info-row">
+                    <span class="label">👶 Number of Kids:</span>
+                    <span class="value">{{ rsvp.number_of_kids }}</span>
+                </div>
+                <div class="info-row">
+                    <span class="label">👨‍👩‍👧 Number of Adults:</span>
+                    <span class="value">{{ rsvp.number_of_adults }}</span>
+                </div>
+                {% if rsvp.food_allergies %}
+                <div class="info-row">
+                    <span class="label">🚫 Food Allergies:</span>
+                    <span class="value">{{ rsvp.food_allergies }}</span>
+                </div>
+                {% endif %}
+            </div>
+
+            {% if rsvp.birthday_message %}
+            <div class="message-box">
+                <strong>💌 Birthday Message:</strong><br>
+                "{{ rsvp.birthday_message }}"
+            </div>
+            {% endif %}
+
+            <div class="footer">
+                <p>RSVP received on {{ received_at }}</p>
+                <p>View all RSVPs in your admin dashboard</p>
+            </div>
+        </div>
+    </body>
+</html>
+""")
+
+# HTML body for the confirmation sent back to the guest
+GUEST_HTML = _minify_html("""
+<html>
+    <head>
+        <style>""" + _GUEST_CSS + """</style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>🎉 Thank You for Your RSVP! 🎉</h1>
+                <p>Hi {{ rsvp.parent_name }}!</p>
+            </div>
+
+            <p>We're {% if rsvp.attendance_status == 'yes' %}thrilled{% else %}sorry{% endif %}
+            {% if rsvp.attendance_status == 'yes' %}that you can join us{% else %}you cannot make it{% endif %}
+            for {{ party.child_name }}'s {{ party.age }}th birthday party!</p>
+
+            {% if rsvp.attendance_status == 'yes' %}
+            {{ party_block | safe }}
+            {% endif %}
+
+            <div class="footer">
+                <p>If you need to update your RSVP, please contact us.</p>
+                <p style="margin-top: 15px;">See you at the party! 🎈</p>
+            </div>
+        </div>
+    </body>
+</html>
+""")
+
+# Party details block for the guest confirmation; identical for every
+# guest of the same party, so renders are cached below
+_PARTY_BLOCK_HTML = _minify_html("""
+            <div class="party-details">
+                <h3 style="color: #FF6B9D; margin-bottom: 15px;">Party Details:</h3>
+                <div class="detail-row">
+                    <span class="emoji">📅</span>
+                    <strong>Date:</strong> {{ party.party_date }}
+                </div>
+                <div class="detail-row">
+                    <span class="emoji">🕐</span>
+                    <strong>Time:</strong> {{ party.party_time_start }} - {{ party.party_time_end }}
+                </div>
+                <div class="detail-row">
+                    <span class="emoji">📍</span>
+                    <strong>Location:</strong> {{ party.venue_name }}<br>
+                    <span style="margin-left: 30px;">{{ party.venue_address }}</span>
+                </div>
+            </div>
+""")
+
+# Compile the templates once at import time so each send only pays for
+# rendering, not for re-parsing the HTML and CSS. Autoescaping runs
+# through markupsafe's C escape on every interpolated field, so
+# user-submitted values (names, messages) can never inject markup;
+# trusted pre-rendered fragments are passed through the |safe filter.
+_ENV = jinja2.Environment(
+    loader=jinja2.BaseLoader(),
+    autoescape=jinja2.select_autoescape(['html']),
+    undefined=jinja2.ChainableUndefined,
+    auto_reload=False,
+    cache_size=-1
+)
+_RSVP_TPL = _ENV.from_string(RSVP_HTML)
+_GUEST_TPL = _ENV.from_string(GUEST_HTML)
+_PARTY_BLOCK_TPL = _ENV.from_string(_PARTY_BLOCK_HTML)
+
+
+@functools.lru_cache(maxsize=64)
+def _render_party_block(party_tuple):
+    """
+    Render the party-details block for one party, cached so a broadcast
+    to N guests of the same party only renders it once
+    """
+    child_name, age, party_date, time_start, time_end, venue_name, venue_address = party_tuple
+    return _PARTY_BLOCK_TPL.render(party={
+        'child_name': child_name,
+        'age': age,
+        'party_date': party_date,
+        'party_time_start': time_start,
+        'party_time_end': time_end,
+        'venue_name': venue_name,
+        'venue_address': venue_address
+    })
+
+
+_FOOTER_CACHE = (None, None)  # (minute key, formatted string)
+
+
+def _now_footer():
+    """
+    Formatted "received on" timestamp for the notification footer,
+    cached per minute since strftime adds up on bulk sends
+    """
+    global _FOOTER_CACHE
+    now = datetime.now()
+    key = (now.year, now.month, now.day, now.hour, now.minute)
+    if _FOOTER_CACHE[0] == key:
+        return _FOOTER_CACHE[1]
+    formatted = now.strftime('%B %d, %Y at %I:%M %p')
+    _FOOTER_CACHE = (key, formatted)
+    return formatted
+
+
+def _party_key(party_data):
+    """
+    Immutable cache key for _render_party_block
+    """
+    return (
+        party_data['child_name'],
+        party_data['age'],
+        party_data['party_date'],
+        party_data['party_time_start'],
+        party_data['party_time_end'],
+        party_data['venue_name'],
+        party_data['venue_address']
+    )
+
+
 class EmailNotifier:
-    def __init__(self, smtp_server, smtp_port, email, password):
+    def __init__(self, smtp_server, smtp_port, email, password, max_per_connection=100,
+                 rate_window=60):
         """
         Initialize email notifier
-        
+
         Args:
             smtp_server: SMTP server address (e.g., 'smtp.gmail.com')
             smtp_port: SMTP port (e.g., 587 for TLS)
             email: Your email address
             password: Your email password or app-specific password
+            max_per_connection: Messages to send before rotating the SMTP
+                connection (avoids provider "too many login attempts" limits)
+            rate_window: Seconds during which an identical email to the
+                same recipient is treated as a duplicate and dropped
         """
         self.smtp_server = smtp_server
         self.smtp_port = smtp_port
         self.email = email
         self.password = password
-    
+        # Disabled (e.g. dev/staging without credentials) means every
+        # send_* call returns immediately without rendering anything
+        self.enabled = bool(smtp_server and email and password)
+        self.max_per_connection = max_per_connection
+        self.rate_window = rate_window
+        self._last_sent = {}  # (recipient, body hash) -> monotonic ts
+        # One SSL context for all connections; building one reloads the
+        # CA store from disk, so don't pay that per handshake
+        self._ssl_ctx = ssl.create_default_context()
+        # Pooled connections are per-thread, so the worker threads below
+        # each reuse their own logged-in session without locking
+        self._local = threading.local()
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        self._queue = queue.Queue(maxsize=1000)
+        self._worker = None
+        atexit.register(self.close)
+
+    @property
+    def _conn(self):
+        return getattr(self._local, 'conn', None)
+
+    @_conn.setter
+    def _conn(self, value):
+        self._local.conn = value
+
+    @property
+    def _sent_on_conn(self):
+        return getattr(self._local, 'sent_on_conn', 0)
+
+    @_sent_on_conn.setter
+    def _sent_on_conn(self, value):
+        self._local.sent_on_conn = value
+        self._local.last_used = time.monotonic()
+
+    @property
+    def _last_used(self):
+        return getattr(self._local, 'last_used', 0.0)
+
+    def _get_conn(self):
+        """
+        Return a logged-in SMTP connection, reusing the previous one when
+        possible so repeated sends skip the TCP + TLS + LOGIN handshakes
+        """
+        if self._conn is not None and self._sent_on_conn >= self.max_per_connection:
+            # Rotate the connection after too many messages
+            self.close()
+        elif self._conn is not None and time.monotonic() - self._last_used > _IDLE_PROBE_AFTER:
+            # The server may have dropped an idle connection without us
+            # noticing; a quick NOOP turns a multi-minute send stall into
+            # a sub-second reconnect
+            try:
+                self._conn.sock.settimeout(_CONNECT_TIMEOUT)
+                self._conn.noop()
+                self._conn.sock.settimeout(_SEND_TIMEOUT)
+            except Exception:
+                self.close()
+        if self._conn is None:
+            self._conn = smtplib.SMTP(self.smtp_server, self.smtp_port,
+                                      timeout=_CONNECT_TIMEOUT)
+            self._conn.ehlo()
+            self._conn.starttls(context=self._ssl_ctx)
+            self._conn.ehlo()
+            self._conn.login(self.email, self.password)
+            self._enable_keepalive(self._conn.sock)
+            # Connected: give the rest of the dialogue more headroom
+            self._conn.sock.settimeout(_SEND_TIMEOUT)
+            self._sent_on_conn = 0
+        return self._conn
+
+    @staticmethod
+    def _enable_keepalive(sock):
+        """
+        Turn on TCP keepalive so a dead peer is noticed while the pooled
+        connection sits idle
+        """
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if hasattr(socket, 'TCP_KEEPIDLE'):  # Linux only
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3)
+
+    def close(self):
+        """
+        Close the calling thread's pooled SMTP connection (called
+        automatically at exit for the main thread; worker connections
+        die with their daemon threads)
+        """
+        if self._conn is not None:
+            try:
+                self._conn.quit()
+            except Exception:
+                pass
+            self._conn = None
+            self._sent_on_conn = 0
+
+    def _ensure_worker(self):
+        """
+        Start the background send worker on first use
+        """
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._drain_queue, daemon=True)
+            self._worker.start()
+
+    def _drain_queue(self):
+        """
+        Worker loop: pull queued sends and run them over the pooled
+        connection, keeping SMTP latency off the caller's thread
+        """
+        while True:
+            kind, rsvp_data, party_data = self._queue.get()
+            try:
+                if kind == 'notify':
+                    self.send_rsvp_notification(rsvp_data, party_data)
+                else:
+                    self.send_confirmation_to_guest(rsvp_data, party_data)
+            except Exception:
+                logger.exception("Error in background email worker")
+            finally:
+                self._queue.task_done()
+
+    def send_rsvp_notification_async(self, rsvp_data, party_data):
+        """
+        Queue the host notification and return immediately; the email is
+        sent from a background worker thread
+
+        Args:
+            rsvp_data: Dictionary containing RSVP information
+            party_data: Dictionary containing party information
+        """
+        self._ensure_worker()
+        self._queue.put(('notify', rsvp_data, party_data))
+
+    def send_confirmation_to_guest_async(self, rsvp_data, party_data):
+        """
+        Queue the guest confirmation and return immediately; the email is
+        sent from a background worker thread
+
+        Args:
+            rsvp_data: Dictionary containing RSVP information
+            party_data: Dictionary containing party information
+        """
+        self._ensure_worker()
+        self._queue.put(('confirm', rsvp_data, party_data))
+
     def send_rsvp_notification(self, rsvp_data, party_data):
         """
         Send email notification when someone RSVPs
-        
+
         Args:
             rsvp_data: Dictionary containing RSVP information
             party_data: Dictionary containing party information
         """
+        if not self.enabled:
+            return None
+
         subject = f"🎉 New RSVP for {party_data['child_name']}'s Birthday Party!"
-        
-        # Create HTML email body
-        html_body = f"""
-        <html>
-            <head>
-                <style>
-                    body {{
-                        font-family: 'Arial', sans-serif;
-                        background-color: #f8f9fa;
-                        padding: 20px;
-                    }}
-                    .container {{
-                        max-width: 600px;
-                        margin: 0 auto;
-                        background: white;
-                        border-radius: 15px;
-                        padding: 30px;
-                        box-shadow: 0 5px 20px rgba(0,0,0,0.1);
-                    }}
-                    .header {{
-                        text-align: center;
-                        margin-bottom: 30px;
-                    }}
-                    .header h1 {{
-                        color: #FF6B9D;
-                        font-size: 28px;
-                        margin-bottom: 10px;
-                    }}
-                    .info-box {{
-                        background: #FFE5F0;
-                        padding: 20px;
-                        border-radius: 10px;
-                        margin-bottom: 20px;
-                    }}
-                    .info-row {{
-                        margin-bottom: 10px;
-                    }}
-                    .label {{
-                        font-weight: bold;
-                        color: #666;
-                    }}
-                    .value {{
-                        color: #333;
-                    }}
-                    .status {{
-                        display: inline-block;
-                        padding: 8px 15px;
-                        border-radius: 20px;
-                        color: white;
-                        font-weight: bold;
-                    }}
-                    .status-yes {{
-                        background: linear-gradient(135deg, #6BCB77, #4D96FF);
-                    }}
-                    .status-no {{
-                        background: linear-gradient(135deg, #FF6B9D, #FF8FAB);
-                    }}
-                    .message-box {{
-                        background: #E5F3FF;
-                        padding: 15px;
-                        border-radius: 10px;
-                        margin-top: 20px;
-                        font-style: italic;
-                    }}
-                    .footer {{
-                        text-align: center;
-                        margin-top: 30px;
-                        color: #999;
-                        font-size: 12px;
-                    }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="header">
-                        <h1>🎉 New RSVP Received!</h1>
-                        <p>Someone just responded to {party_data['child_name']}'s party invitation</p>
-                    </div>
-                    
-                    <div class="info-box">
-                        <div class="info-row">
-                            <span class="label">👶 Child's Name:</span>
-                            <span class="value">{rsvp_data['child_name']}</span>
-                        </div>
-                        <div class="info-row">
-                            <span class="label">👨‍👩‍👧 Parent's Name:</span>
-                            <span class="value">{rsvp_data['parent_name']}</span>
-                        </div>
-                        <div class="info-row">
-                            <span class="label">📧 Email:</span>
-                            <span class="value">{rsvp_data['email']}</span>
-                        </div>
-                        <div class="info-row">
-                            <span class="label">📱 Phone:</span>
-                            <span class="value">{rsvp_data['phone']}</span>
-                        </div>
-                        <div class="info-row">
-                            <span class="label">Status:</span>
-                            <span class="status status-{rsvp_data['attendance_status']}">
-                                {'✅ Coming!' if rsvp_data['attendance_status'] == 'yes' else '❌ Cannot Attend' if rsvp_data['attendance_status'] == 'no' else '❓ Maybe'}
-                            </span>
-                        </div>
-                        <div class="info-row">
-                            <span class="label">👶 Number of Kids:</span>
-                            <span class="value">{rsvp_data.get('number_of_kids', 1)}</span>
-                        </div>
-                        <div class="info-row">
-                            <span class="label">👨‍👩‍👧 Number of Adults:</span>
-                            <span class="value">{rsvp_data.get('number_of_adults', 1)}</span>
-                        </div>
-                        {f'''
-                        <div class="info-row">
-                            <span class="label">🚫 Food Allergies:</span>
-                            <span class="value">{rsvp_data.get('food_allergies', 'None')}</span>
-                        </div>
-                        ''' if rsvp_data.get('food_allergies') else ''}
-                    </div>
-                    
-                    {f'''
-                    <div class="message-box">
-                        <strong>💌 Birthday Message:</strong><br>
-                        "{rsvp_data.get('birthday_message', '')}"
-                    </div>
-                    ''' if rsvp_data.get('birthday_message') else ''}
-                    
-                    <div class="footer">
-                        <p>RSVP received on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}</p>
-                        <p>View all RSVPs in your admin dashboard</p>
-                    </div>
-                </div>
-            </body>
-        </html>
-        """
-        
-        # Send email
-        self._send_email(self.email, subject, html_body)
-    
+
+        # Fill in the optional fields once instead of .get() per field
+        rsvp = {**_RSVP_DEFAULTS, **rsvp_data}
+
+        # Body is rendered lazily, only once the connection is up
+        return self._send_email(
+            self.email, subject,
+            lambda: _RSVP_TPL.render(rsvp=rsvp, party=party_data, received_at=_now_footer(),
+                                     badge=_STATUS_BADGE.get(rsvp['attendance_status'], _STATUS_BADGE['maybe']))
+        )
+
     def send_confirmation_to_guest(self, rsvp_data, party_data):
         """
         Send confirmation email to the guest who submitted RSVP
-        
+
         Args:
             rsvp_data: Dictionary containing RSVP information
             party_data: Dictionary containing party information
         """
+        if not self.enabled:
+            return None
+
         subject = f"🎉 RSVP Confirmation - {party_data['child_name']}'s Birthday Party"
-        
-        html_body = f"""
-        <html>
-            <head>
-                <style>
-                    body {{
-                        font-family: 'Arial', sans-serif;
-                        background-color: #f8f9fa;
-                        padding: 20px;
-                    }}
-                    .container {{
-                        max-width: 600px;
-                        margin: 0 auto;
-                        background: white;
-                        border-radius: 15px;
-                        padding: 30px;
-                        box-shadow: 0 5px 20px rgba(0,0,0,0.1);
-                    }}
-                    .header {{
-                        text-align: center;
-                        margin-bottom: 30px;
-                    }}
-                    .header h1 {{
-                        color: #FF6B9D;
-                        font-size: 28px;
-                    }}
-                    .party-details {{
-                        background: linear-gradient(135deg, #FFE5F0, #E5F3FF);
-                        padding: 25px;
-                        border-radius: 10px;
-                        margin-bottom: 20px;
-                    }}
-                    .detail-row {{
-                        margin-bottom: 12px;
-                        font-size: 16px;
-                    }}
-                    .emoji {{
-                        margin-right: 8px;
-                    }}
-                    .footer {{
-                        text-align: center;
-                        margin-top: 30px;
-                        padding-top: 20px;
-                        border-top: 2px solid #FFE5F0;
-                        color: #666;
-                    }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="header">
-                        <h1>🎉 Thank You for Your RSVP! 🎉</h1>
-                        <p>Hi {rsvp_data['parent_name']}!</p>
-                    </div>
-                    
-                    <p>We're {'thrilled' if rsvp_data['attendance_status'] == 'yes' else 'sorry'} 
-                    {'that you can join us' if rsvp_data['attendance_status'] == 'yes' else 'you cannot make it'} 
-                    for {party_data['child_name']}'s {party_data['age']}th birthday party!</p>
-                    
-                    {f'''
-                    <div class="party-details">
-                        <h3 style="color: #FF6B9D; margin-bottom: 15px;">Party Details:</h3>
-                        <div class="detail-row">
-                            <span class="emoji">📅</span>
-                            <strong>Date:</strong> {party_data['party_date']}
-                        </div>
-                        <div class="detail-row">
-                            <span class="emoji">🕐</span>
-                            <strong>Time:</strong> {party_data['party_time_start']} - {party_data['party_time_end']}
-                        </div>
-                        <div class="detail-row">
-                            <span class="emoji">📍</span>
-                            <strong>Location:</strong> {party_data['venue_name']}<br>
-                            <span style="margin-left: 30px;">{party_data['venue_address']}</span>
-                        </div>
-                    </div>
-                    ''' if rsvp_data['attendance_status'] == 'yes' else ''}
-                    
-                    <div class="footer">
-                        <p>If you need to update your RSVP, please contact us.</p>
-                        <p style="margin-top: 15px;">See you at the party! 🎈</p>
-                    </div>
-                </div>
-            </body>
-        </html>
-        """
-        
+
         # Send confirmation to guest
-        self._send_email(rsvp_data['email'], subject, html_body)
-    
+        return self._send_email(
+            rsvp_data['email'], subject,
+            lambda: _GUEST_TPL.render(rsvp=rsvp_data, party=party_data,
+                                      party_block=_render_party_block(_party_key(party_data)))
+        )
+
+    def send_rsvp_and_confirmation(self, rsvp_data, party_data):
+        """
+        Send the host notification and the guest confirmation in
+        parallel on two worker threads, each with its own pooled
+        connection, so the pair takes one SMTP round-trip of wall time
+
+        Args:
+            rsvp_data: Dictionary containing RSVP information
+            party_data: Dictionary containing party information
+        """
+        if not self.enabled:
+            return None
+
+        f1 = self._pool.submit(self.send_rsvp_notification, rsvp_data, party_data)
+        f2 = self._pool.submit(self.send_confirmation_to_guest, rsvp_data, party_data)
+        concurrent.futures.wait([f1, f2])
+        return f1.result(), f2.result()
+
+    def send_rsvp_pair(self, rsvp_data, party_data):
+        """
+        Send the host notification and the guest confirmation over a
+        single SMTP session instead of two
+
+        Args:
+            rsvp_data: Dictionary containing RSVP information
+            party_data: Dictionary containing party information
+        """
+        if not self.enabled:
+            return None
+
+        # Fill in the optional fields once instead of .get() per field
+        rsvp = {**_RSVP_DEFAULTS, **rsvp_data}
+
+        notif_html = _RSVP_TPL.render(rsvp=rsvp, party=party_data, received_at=_now_footer(),
+                                      badge=_STATUS_BADGE.get(rsvp['attendance_status'], _STATUS_BADGE['maybe']))
+        guest_html = _GUEST_TPL.render(rsvp=rsvp_data, party=party_data,
+                                       party_block=_render_party_block(_party_key(party_data)))
+
+        messages = []
+        if not self._should_suppress(self.email, notif_html):
+            messages.append(self._build_message(
+                self.email,
+                f"🎉 New RSVP for {party_data['child_name']}'s Birthday Party!",
+                notif_html
+            ))
+        if not self._should_suppress(rsvp_data['email'], guest_html):
+            messages.append(self._build_message(
+                rsvp_data['email'],
+                f"🎉 RSVP Confirmation - {party_data['child_name']}'s Birthday Party",
+                guest_html
+            ))
+        if not messages:
+            return True
+
+        try:
+            # Both messages go back-to-back on the pooled connection, so
+            # the connect/TLS/AUTH cost is paid once for the pair
+            try:
+                conn = self._get_conn()
+                for message in messages:
+                    conn.send_message(message)
+            except (smtplib.SMTPServerDisconnected, ConnectionResetError, OSError):
+                self._conn = None
+                conn = self._get_conn()
+                for message in messages:
+                    conn.send_message(message)
+            self._sent_on_conn += len(messages)
+
+            for message in messages:
+                logger.info("Email sent to %s", message['To'])
+            return True
+
+        except (smtplib.SMTPException, OSError):
+            logger.exception("Error sending email to %s", rsvp_data['email'])
+            return False
+
+    def _should_suppress(self, to_email, html_body):
+        """
+        True when an identical body already went to the same recipient
+        within the rate window — a double-submitted RSVP form, not a new
+        RSVP — so repeat submits don't burn SMTP dialogues or trip
+        provider throttling
+        """
+        key = (to_email, hash(html_body))
+        t = time.monotonic()
+        if t - self._last_sent.get(key, -self.rate_window) < self.rate_window:
+            logger.info("Suppressing duplicate send to %s", to_email)
+            return True
+        if len(self._last_sent) > 1024:
+            self._last_sent = {k: ts for k, ts in self._last_sent.items()
+                               if t - ts < self.rate_window}
+        self._last_sent[key] = t
+        return False
+
+    def _build_message(self, to_email, subject, html_body):
+        """
+        Build the MIME message for one email
+        """
+        message = EmailMessage()
+        message['From'] = self.email
+        message['To'] = to_email
+        message['Subject'] = subject
+
+        # Plain-text fallback plus the HTML alternative
+        message.set_content('See HTML version.')
+        message.add_alternative(html_body, subtype='html')
+        return message
+
     def _send_email(self, to_email, subject, html_body):
         """
         Internal method to send email
+
+        html_body may be a callable returning the body, in which case it
+        is only rendered after the connection is up — a fast connection
+        failure then costs no rendering at all
         """
+        if not self.enabled:
+            return None
         try:
-            # Create message
-            message = MIMEMultipart('alternative')
-            message['From'] = self.email
-            message['To'] = to_email
-            message['Subject'] = subject
-            
-            # Attach HTML body
-            html_part = MIMEText(html_body, 'html')
-            message.attach(html_part)
-            
-            # Connect to SMTP server and send
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.email, self.password)
-                server.send_message(message)
-            
-            print(f"Email sent successfully to {to_email}")
+            conn = self._get_conn()
+            if callable(html_body):
+                html_body = html_body()
+            if self._should_suppress(to_email, html_body):
+                return True
+            message = self._build_message(to_email, subject, html_body)
+
+            # Send over the pooled connection, reconnecting once if the
+            # server dropped it while idle
+            try:
+                conn.send_message(message)
+            except (smtplib.SMTPServerDisconnected, ConnectionResetError, OSError):
+                self._conn = None
+                self._get_conn().send_message(message)
+            self._sent_on_conn += 1
+
+            logger.info("Email sent to %s", to_email)
             return True
-            
-        except Exception as e:
-            print(f"Error sending email: {e}")
+
+        except (smtplib.SMTPException, OSError):
+            logger.exception("Error sending email to %s", to_email)
             return False
 
 
@@ -333,7 +755,7 @@ if __name__ == '__main__':
         email='your_email@gmail.com',  # Replace with your email
         password='your_app_password'    # Replace with your app password
     )
-    
+
     # Example party data
     party_data = {
         'child_name': 'Emma',
@@ -344,7 +766,7 @@ if __name__ == '__main__':
         'venue_name': 'Happy Kids Party Place',
         'venue_address': '123 Rainbow Street, Funtown, State 12345'
     }
-    
+
     # Example RSVP data
     rsvp_data = {
         'child_name': 'Sarah',
@@ -357,7 +779,7 @@ if __name__ == '__main__':
         'food_allergies': 'None',
         'birthday_message': 'Happy Birthday Emma! Can\'t wait to celebrate with you!'
     }
-    
+
     # Send notifications
     notifier.send_rsvp_notification(rsvp_data, party_data)
     notifier.send_confirmation_to_guest(rsvp_data, party_data)